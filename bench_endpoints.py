@@ -0,0 +1,320 @@
+# Load test of the API against SQLite.
+# Seeds synthetic data shaped like prueba.csv (NASA POWER) and the GBIF occurrence zip through the
+# loaders, then runs a random read/write mix over every CRUD route with the Flask test client and
+# reports p50/p95/p99 latency, requests per second and SQL statements per request as JSON.
+# Usage: python bench_endpoints.py [--db FILE] [--zones 5] [--days 365] [--occurrences 2000]
+#                                  [--requests 5000] [--write-ratio 0.1] [--output results.json]
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+import zipfile
+from datetime import date, timedelta
+
+from sqlalchemy import event, select
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+NASA_SAMPLE = os.path.join(HERE, 'prueba.csv')
+GBIF_SAMPLE = os.path.join(HERE, '0023596-241126133413365.zip')
+START_DATE = date(2020, 1, 1)
+
+
+# Header lines and per-parameter (mean, stdev) of the sample NASA POWER file
+def nasa_shape():
+    with open(NASA_SAMPLE, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    end = lines.index('-END HEADER-')
+    header, columns = lines[:end + 1], lines[end + 1].split(',')
+    values = {name: [] for name in columns[2:]}
+    for row in csv.reader(lines[end + 2:]):
+        for name, value in zip(columns[2:], row[2:]):
+            if float(value) != -999.0:
+                values[name].append(float(value))
+    stats = {name: (statistics.mean(v), statistics.pstdev(v)) if v else None for name, v in values.items()}
+    return header, columns, stats
+
+
+# NASA POWER CSV text for one location and `days` consecutive days
+def nasa_file(rng, shape, latitude, longitude, days):
+    header, columns, stats = shape
+    lines = [f'Location: Latitude  {latitude}   Longitude {longitude} ' if line.startswith('Location:') else line
+             for line in header]
+    lines.append(','.join(columns))
+    for offset in range(days):
+        day = START_DATE + timedelta(days=offset)
+        row = [str(day.year), str(day.timetuple().tm_yday)]
+        for name in columns[2:]:
+            stat = stats[name]
+            row.append('-999.0' if stat is None else f'{max(0.0, rng.gauss(*stat)):.2f}')
+        lines.append(','.join(row))
+    return [line + '\n' for line in lines]
+
+
+# GBIF zip with `count` occurrences copied from the sample rows, moved to the given zones and days
+def gbif_file(rng, zones, days, count):
+    with zipfile.ZipFile(GBIF_SAMPLE) as archive:
+        with archive.open(archive.namelist()[0]) as f:
+            reader = csv.DictReader(io.TextIOWrapper(f, encoding='utf-8'), delimiter='\t', quoting=csv.QUOTE_NONE)
+            columns = reader.fieldnames
+            samples = [row for _, row in zip(range(500), reader)]
+
+    out = io.StringIO()
+    writer = csv.DictWriter(out, columns, delimiter='\t', quoting=csv.QUOTE_NONE, escapechar='\\',
+                            lineterminator='\n')
+    writer.writeheader()
+    for i in range(count):
+        row = dict(rng.choice(samples))
+        latitude, longitude = rng.choice(zones)
+        row['gbifID'] = str(1000000000 + i)
+        row['decimalLatitude'] = f'{latitude + rng.uniform(-0.05, 0.05):.6f}'
+        row['decimalLongitude'] = f'{longitude + rng.uniform(-0.05, 0.05):.6f}'
+        row['eventDate'] = (START_DATE + timedelta(days=rng.randrange(days))).isoformat()
+        writer.writerow(row)
+    data = io.BytesIO()
+    with zipfile.ZipFile(data, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('occurrence.csv', out.getvalue())
+    data.seek(0)
+    return data
+
+
+def seed(prueba, rng, zones, days, occurrences):
+    coordinates = [(round(rng.uniform(-4.5, -0.5), 4), round(rng.uniform(-80, -76), 4)) for _ in range(zones)]
+    shape = nasa_shape()
+    for latitude, longitude in coordinates:
+        prueba.ingest_nasa_power(nasa_file(rng, shape, latitude, longitude, days))
+    prueba.ingest_gbif(gbif_file(rng, coordinates, days, occurrences), snap_km=20)
+
+
+# Percentile of a sorted list (nearest rank)
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Workload:
+    # Collection path -> (model name, primary key)
+    RESOURCES = {
+        '/wind': ('Wind', 'Wind_ID'),
+        '/precipitation': ('Precipitation', 'Precipitation_ID'),
+        '/pressure': ('Pressure', 'Pressure_ID'),
+        '/humidity': ('Humidity', 'Humidity_ID'),
+        '/geographiczone': ('GeographicZone', 'GeographicZone_ID'),
+        '/weathermeasurement': ('WeatherMeasurement', 'ClimateMeasurement_ID'),
+        '/vegetation': ('Vegetation', 'Vegetation_ID'),
+    }
+    LIST_PATHS = tuple(RESOURCES)
+
+    def __init__(self, prueba, client, rng, days):
+        self.client = client
+        self.rng = rng
+        self.days = days
+        with client.application.app_context():
+            self.ids = {path: list(prueba.db.session.execute(
+                select(getattr(getattr(prueba, model), pk))).scalars())
+                for path, (model, pk) in self.RESOURCES.items()}
+        self.created = {path: [] for path in self.LIST_PATHS}
+        self.zones = list(self.ids['/geographiczone'])
+        self.next_day = days
+        self.pending = {}  # (date, zone) after the seeded range -> component paths POSTed for it
+        self.held = {}  # (date, zone) -> (path, id) of its components, not deleted until its measurement exists
+
+    def day(self):
+        return (START_DATE + timedelta(days=self.rng.randrange(self.days))).isoformat()
+
+    # A day after the seeded range, so that the POST inserts a row (a seeded date and zone would be an
+    # upsert of the seeded row) which a later DELETE can remove. Days are reused until all four
+    # components exist, and are then given to a measurement POST.
+    def new_day(self, zone, component):
+        for (day, key_zone), paths in self.pending.items():
+            if key_zone == zone and component not in paths:
+                paths.add(component)
+                return day
+        day = (START_DATE + timedelta(days=self.next_day)).isoformat()
+        self.next_day += 1
+        self.pending[(day, zone)] = {component}
+        return day
+
+    # A (date, zone) whose components were all POSTed, or a seeded day (an upsert) when there is none
+    def measurement_key(self, zone):
+        for key, paths in self.pending.items():
+            if len(paths) == 4:
+                del self.pending[key]
+                for path, row_id in self.held.pop(key, ()):
+                    self.created[path].append(row_id)
+                return key
+        return self.day(), zone
+
+    def pick(self, path):
+        return self.rng.choice(self.ids[path])
+
+    # Candidate operations as (label, function returning the response)
+    def reads(self):
+        c, rng = self.client, self.rng
+        path = rng.choice(self.LIST_PATHS)
+        return [
+            (f'GET {path}?limit=100', lambda: c.get(f'{path}?limit=100')),
+            (f'GET {path}/<id>', lambda: c.get(f'{path}/{self.pick(path)}')),
+            ('GET /weathermeasurement?expand=all&limit=100', lambda: c.get('/weathermeasurement?expand=all&limit=100')),
+            ('GET /weathermeasurement/rollup', lambda: c.get(
+                f'/weathermeasurement/rollup?zone={rng.choice(self.zones)}&granularity=month')),
+            ('GET /geographiczone/nearest', lambda: c.get(
+                f'/geographiczone/nearest?lat={rng.uniform(-4.5, -0.5)}&lon={rng.uniform(-80, -76)}&k=3')),
+        ]
+
+    def writes(self):
+        c, rng = self.client, self.rng
+        zone = rng.choice(self.zones)
+        component = rng.choice(('/wind', '/precipitation', '/pressure', '/humidity'))
+        payloads = {
+            '/wind': {'Wind_Speed': rng.uniform(0, 5), 'Wind_Direction': rng.uniform(0, 360)},
+            '/precipitation': {'Precipitation_Amount': rng.uniform(0, 20)},
+            '/pressure': {'PressureValue': rng.uniform(80, 90)},
+            '/humidity': {'SurfaceSoilWetness': rng.uniform(0, 1)},
+        }
+        operations = [
+            (f'POST {component}', lambda: self.create(component, c.post(component, json=dict(
+                payloads[component], Date=self.new_day(zone, component), GeographicZone_ID=zone)))),
+            (f'PUT {component}/<id>', lambda: c.put(f'{component}/{self.pick(component)}', json=payloads[component])),
+            ('POST /weathermeasurement', lambda: self.create('/weathermeasurement', c.post('/weathermeasurement', json=dict(
+                zip(('Date', 'GeographicZone_ID'), self.measurement_key(zone)),
+                Max_Temperature_2m=rng.uniform(20, 30), Min_Temperature_2m=rng.uniform(10, 18))))),
+            ('PUT /update_weathermeasurement/<id>', lambda: c.put(
+                f'/update_weathermeasurement/{self.pick("/weathermeasurement")}',
+                json={'Max_Temperature_2m': rng.uniform(20, 30)})),
+            ('POST /geographiczone', lambda: self.create('/geographiczone', c.post('/geographiczone', json={
+                'Zone_Name': 'bench', 'Latitude': rng.uniform(-4.5, -0.5), 'Longitude': rng.uniform(-80, -76)}))),
+            ('PUT /geographiczone/<id>', lambda: c.put(f'/geographiczone/{self.pick("/geographiczone")}',
+                                                       json={'Altitude': rng.uniform(0, 3000)})),
+        ]
+        if self.ids['/vegetation']:
+            operations += [
+                ('POST /vegetation', lambda: self.create('/vegetation', c.post('/vegetation', json=self.vegetation()))),
+                ('PUT /vegetation/<id>', lambda: c.put(f'/vegetation/{self.pick("/vegetation")}',
+                                                       json={'Vegetation_Type': 'bench'})),
+            ]
+        # Deletes only remove rows created by the benchmark
+        for path, created in self.created.items():
+            if created:
+                operations.append((f'DELETE {path}/<id>', lambda path=path, created=created: c.delete(
+                    f'{path}/{created.pop(rng.randrange(len(created)))}')))
+        return operations
+
+    def vegetation(self):
+        source = self.client.get(f'/vegetation/{self.pick("/vegetation")}?expand=all').get_json()
+        return {'ClimateMeasurement_ID': source['weather_measurement']['ClimateMeasurement_ID'],
+                'Wind_ID': source['wind']['Wind_ID'], 'Pressure_ID': source['pressure']['Pressure_ID'],
+                'GeographicZone_ID': source['geographic_zone']['GeographicZone_ID'], 'Vegetation_Type': 'bench'}
+
+    def create(self, path, response):
+        body = response.get_json(silent=True) or {}
+        new_id = body.get('id', body.get(self.RESOURCES[path][1]))
+        # POSTs of a seeded (date, zone) update the seeded row; only new rows may be deleted later
+        if response.status_code == 201 and new_id is not None and new_id not in self.ids[path] \
+                and new_id not in self.created[path]:
+            key = (body.get('Date'), body.get('GeographicZone_ID'))
+            if key in self.pending:
+                self.held.setdefault(key, []).append((path, new_id))
+            else:
+                self.created[path].append(new_id)
+        return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the API against SQLite.')
+    parser.add_argument('--db', default=None, help='SQLite file (default: a temporary file); ":memory:" for in-memory.')
+    parser.add_argument('--zones', type=int, default=5)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--occurrences', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--write-ratio', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default=None, help='Write the JSON report to this file instead of stdout.')
+    args = parser.parse_args()
+
+    if args.db == ':memory:':
+        uri = 'sqlite://'
+    else:
+        uri = 'sqlite:///' + os.path.abspath(args.db or os.path.join(tempfile.mkdtemp(), 'bench_endpoints.db'))
+    os.environ['SQLALCHEMY_DATABASE_URI'] = uri
+    import prueba
+
+    rng = random.Random(args.seed)
+    app = prueba.create_app()
+    with app.app_context():
+        prueba.db.drop_all()
+        prueba.db.create_all()
+        started = time.perf_counter()
+        seed(prueba, rng, args.zones, args.days, args.occurrences)
+        seed_seconds = time.perf_counter() - started
+
+        statements = [0]
+        event.listen(prueba.db.engine, 'before_cursor_execute', lambda *a: statements.__setitem__(0, statements[0] + 1))
+
+    client = app.test_client()
+    workload = Workload(prueba, client, rng, args.days)
+    samples = {}
+    errors = {}
+    started = time.perf_counter()
+    for _ in range(args.requests):
+        operations = workload.writes() if rng.random() < args.write_ratio else workload.reads()
+        label, operation = rng.choice(operations)
+        before = statements[0]
+        t0 = time.perf_counter()
+        response = operation()
+        elapsed = time.perf_counter() - t0
+        samples.setdefault(label, []).append((elapsed, statements[0] - before))
+        if response.status_code >= 400:
+            errors[label] = errors.get(label, 0) + 1
+    total_seconds = time.perf_counter() - started
+
+    routes = {}
+    for label, values in sorted(samples.items()):
+        latencies = sorted(v[0] * 1000 for v in values)
+        routes[label] = {
+            'requests': len(values),
+            'errors': errors.get(label, 0),
+            'p50_ms': round(percentile(latencies, 0.50), 3),
+            'p95_ms': round(percentile(latencies, 0.95), 3),
+            'p99_ms': round(percentile(latencies, 0.99), 3),
+            'rps': round(len(values) / (sum(latencies) / 1000), 1),
+            'queries_per_request': round(sum(v[1] for v in values) / len(values), 2),
+        }
+    all_latencies = sorted(v[0] * 1000 for values in samples.values() for v in values)
+    report = {
+        'revision': git_revision(),
+        'database': uri,
+        'config': {k: getattr(args, k) for k in ('zones', 'days', 'occurrences', 'requests', 'write_ratio', 'seed')},
+        'seed_seconds': round(seed_seconds, 3),
+        'total': {
+            'requests': args.requests,
+            'errors': sum(errors.values()),
+            'rps': round(args.requests / total_seconds, 1),
+            'p50_ms': round(percentile(all_latencies, 0.50), 3),
+            'p95_ms': round(percentile(all_latencies, 0.95), 3),
+            'p99_ms': round(percentile(all_latencies, 0.99), 3),
+        },
+        'routes': routes,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
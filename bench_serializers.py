@@ -0,0 +1,103 @@
+# Benchmark of the list serialization: marshmallow schemas + jsonify (the original path)
+# against the RowSerializer fast path, on Wind and WeatherMeasurement fixtures in SQLite.
+# Usage: python bench_serializers.py [--sizes 10000 100000 1000000] [--repeat 3] [--json]
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import insert, select
+
+SEED_CHUNK = 50000
+ZONE_DAYS = 12000
+
+
+# Fill the wind and weather_measurement tables with `size` synthetic rows each
+def seed(prueba, size):
+    db = prueba.db
+    db.drop_all()
+    db.create_all()
+    rng = random.Random(size)
+    start = date(1990, 1, 1)
+    for offset in range(0, size, SEED_CHUNK):
+        count = min(SEED_CHUNK, size - offset)
+        # (Date, zone) is unique: every ZONE_DAYS rows move on to the next zone
+        keys = [(start + timedelta(days=(offset + i) % ZONE_DAYS), 1 + (offset + i) // ZONE_DAYS) for i in range(count)]
+        db.session.execute(insert(prueba.Wind), [
+            {'Wind_Speed': round(rng.uniform(0, 12), 2), 'Wind_Direction': round(rng.uniform(0, 360), 1),
+             'Date': day, 'GeographicZone_ID': zone} for day, zone in keys])
+        db.session.execute(insert(prueba.WeatherMeasurement), [
+            {'Wind_ID': 1, 'Pressure_ID': 1, 'Humidity_ID': 1, 'Precipitation_ID': 1, 'GeographicZone_ID': zone,
+             'Date': day, 'Max_Temperature_2m': round(rng.uniform(15, 35), 2),
+             'Min_Temperature_2m': round(rng.uniform(5, 20), 2), 'Cloud_Amount': None} for day, zone in keys])
+        db.session.commit()
+
+
+# Best time of `repeat` runs and the output of the last one
+def timed(function, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare schema and fast-path list serialization.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON.')
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench_serializers.db')
+    os.environ['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    import prueba
+
+    cases = [
+        (prueba.Wind, prueba.Wind.Wind_ID, prueba.winds_schema),
+        (prueba.WeatherMeasurement, prueba.WeatherMeasurement.ClimateMeasurement_ID,
+         prueba.weather_measurements_schema),
+    ]
+    results = []
+    app = prueba.create_app()
+    with app.app_context():
+        for size in args.sizes:
+            seed(prueba, size)
+            for model, pk_column, many_schema in cases:
+                serializer = prueba.row_serializers[model]
+
+                def schema_path():
+                    prueba.db.session.expunge_all()
+                    return many_schema.jsonify(model.query.order_by(pk_column).all()).get_data()
+
+                def fast_path():
+                    rows = prueba.db.session.execute(select(*serializer.columns).order_by(pk_column)).all()
+                    return (prueba.compact_json(serializer.dump(rows)) + '\n').encode('utf-8')
+
+                schema_seconds, expected = timed(schema_path, args.repeat)
+                fast_seconds, body = timed(fast_path, args.repeat)
+                if body != expected:
+                    raise SystemExit(f'{model.__tablename__}: fast path output differs from the schema output')
+                results.append({
+                    'table': model.__tablename__,
+                    'rows': size,
+                    'bytes': len(body),
+                    'schema_seconds': round(schema_seconds, 4),
+                    'fast_seconds': round(fast_seconds, 4),
+                    'speedup': round(schema_seconds / fast_seconds, 2),
+                })
+                if not args.json:
+                    r = results[-1]
+                    print(f"{r['table']:<20} {r['rows']:>8} rows  schema {r['schema_seconds']:>8.3f}s  "
+                          f"fast {r['fast_seconds']:>8.3f}s  x{r['speedup']}")
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
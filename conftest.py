@@ -0,0 +1,66 @@
+import io
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from prueba import component_cache, create_app, db, ingest_nasa_power
+
+SAMPLE_CSV = Path(__file__).parent / 'prueba.csv'  # NASA POWER, 2024-11-01 to 2024-11-30
+
+# Application on a temporary SQLite file with its tables created by init-db.
+# Settings that the environment could point to external services are overridden.
+def make_app(tmp_path, **config):
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'primary.db'}",
+        'SQLALCHEMY_REPLICA_URIS': [],
+        'RECORD_CACHE_URL': None,
+        'TESTING': True,
+        **config,
+    })
+    result = app.test_cli_runner().invoke(args=['init-db'])
+    assert result.exit_code == 0, result.output
+    # The component cache is per process; IDs of an earlier test's database must not leak in
+    component_cache.clear()
+    return app
+
+@pytest.fixture
+def app(tmp_path):
+    app = make_app(tmp_path)
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+# Primary and one read replica on two SQLite files. Nothing replicates between them, so a row
+# written to the primary is only visible to the reads that are routed to the primary.
+@pytest.fixture
+def replica_app(tmp_path):
+    app = make_app(tmp_path, SQLALCHEMY_REPLICA_URIS=[f"sqlite:///{tmp_path / 'replica.db'}"],
+                   REPLICA_CHECK_SECONDS=3600)
+    with app.app_context():
+        db.metadata.create_all(db.engines['replica_0'])
+    yield app
+    app.extensions['replicas'].stop()
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+# Load prueba.csv into the app's database and return the zone created from its Location header
+def ingest_sample(app):
+    with app.app_context(), open(SAMPLE_CSV, encoding='utf-8', newline='') as f:
+        return ingest_nasa_power(f)['GeographicZone_ID']
+
+# GBIF download zip holding the given occurrences (dicts of GBIF column -> text)
+def gbif_zip(occurrences):
+    columns = list(dict.fromkeys(column for occurrence in occurrences for column in occurrence))
+    lines = ['\t'.join(columns)] + ['\t'.join(occurrence.get(column, '') for column in columns)
+                                    for occurrence in occurrences]
+    data = io.BytesIO()
+    with zipfile.ZipFile(data, 'w') as archive:
+        archive.writestr('occurrence.txt', '\n'.join(lines) + '\n')
+    data.seek(0)
+    return data
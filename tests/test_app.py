@@ -0,0 +1,164 @@
+import threading
+import time
+
+from sqlalchemy import func, select
+
+from prueba import GeographicZone, db
+
+WIND = {'Wind_Speed': 1.5, 'Wind_Direction': 90.0, 'Date': '2024-01-01'}
+
+
+def add_zone(client):
+    response = client.post('/geographiczone', json={'Zone_Name': 'Test', 'Latitude': 1.0, 'Longitude': 2.0})
+    assert response.status_code == 201
+    return response.json['GeographicZone_ID']
+
+
+def add_wind(client, zone_id, **values):
+    response = client.post('/wind', json={**WIND, 'GeographicZone_ID': zone_id, **values})
+    assert response.status_code == 201
+    return response.json
+
+
+# ----------------------- Application factory -----------------------
+
+def test_create_app_on_sqlite(client):
+    assert client.get('/geographiczone').json == {'items': [], 'next_after': None}
+    zone_id = add_zone(client)
+    assert client.get(f'/geographiczone/{zone_id}').json['Zone_Name'] == 'Test'
+    assert [zone['GeographicZone_ID'] for zone in client.get('/geographiczone').json['items']] == [zone_id]
+
+
+def test_collection_is_paginated_by_default(client):
+    zone_id = add_zone(client)
+    for day in range(1, 4):
+        add_wind(client, zone_id, Date=f'2024-01-0{day}')
+    page = client.get('/wind?limit=2').json
+    assert len(page['items']) == 2
+    assert len(client.get(f"/wind?after={page['next_after']}").json['items']) == 1
+    assert len(client.get('/wind?stream=json').json) == 3
+
+
+# ----------------------- Read replicas -----------------------
+
+def test_get_reads_from_replica(replica_app):
+    with replica_app.app_context():
+        zone = GeographicZone(Zone_Name='Primary only')
+        db.session.add(zone)
+        db.session.commit()
+        zone_id = zone.GeographicZone_ID
+    client = replica_app.test_client()
+    assert client.get('/geographiczone').json['items'] == []
+    # A record cache miss is filled from the primary
+    assert client.get(f'/geographiczone/{zone_id}').json['Zone_Name'] == 'Primary only'
+
+
+def test_reads_after_write_use_primary(replica_app):
+    count = select(func.count()).select_from(GeographicZone)
+    with replica_app.test_request_context('/geographiczone', method='GET'):
+        assert db.session.scalar(count) == 0
+        db.session.add(GeographicZone(Zone_Name='Written'))
+        db.session.flush()
+        assert db.session.scalar(count) == 1
+        db.session.rollback()
+
+
+def test_writes_go_to_primary(replica_app):
+    client = replica_app.test_client()
+    zone_id = add_zone(client)
+    with replica_app.app_context():
+        assert db.session.get(GeographicZone, zone_id) is not None
+        with db.engines['replica_0'].connect() as connection:
+            assert connection.scalar(select(func.count()).select_from(GeographicZone)) == 0
+
+
+# ----------------------- Upserts and record cache -----------------------
+
+def test_post_with_same_natural_key_updates_row(client):
+    zone_id = add_zone(client)
+    first = add_wind(client, zone_id)
+    second = add_wind(client, zone_id, Wind_Speed=3.0)
+    assert second['Wind_ID'] == first['Wind_ID']
+    assert [wind['Wind_Speed'] for wind in client.get('/wind').json['items']] == [3.0]
+
+
+def test_upsert_drops_cached_record(client):
+    zone_id = add_zone(client)
+    wind_id = add_wind(client, zone_id)['Wind_ID']
+    assert client.get(f'/wind/{wind_id}').json['Wind_Speed'] == 1.5
+    add_wind(client, zone_id, Wind_Speed=4.0)
+    assert client.get(f'/wind/{wind_id}').json['Wind_Speed'] == 4.0
+
+
+def test_put_drops_cached_record_and_etag(client):
+    zone_id = add_zone(client)
+    wind_id = add_wind(client, zone_id)['Wind_ID']
+    etag = client.get(f'/wind/{wind_id}').headers['ETag']
+    assert client.get(f'/wind/{wind_id}', headers={'If-None-Match': etag}).status_code == 304
+    assert client.put(f'/wind/{wind_id}', json={'Wind_Speed': 2.5}).status_code == 200
+    response = client.get(f'/wind/{wind_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json['Wind_Speed'] == 2.5
+
+
+def test_put_onto_existing_natural_key_is_conflict(client):
+    zone_id = add_zone(client)
+    add_wind(client, zone_id)
+    other_id = add_wind(client, zone_id, Date='2024-01-02')['Wind_ID']
+    response = client.put(f'/wind/{other_id}', json={'Date': WIND['Date']})
+    assert response.status_code == 409
+    assert client.get(f'/wind/{other_id}').json['Date'] == '2024-01-02'
+
+
+def test_batch_with_mixed_payloads_updates_every_column_sent(client):
+    zone_id = add_zone(client)
+    assert client.post('/pressure/batch', json=[
+        {'Date': '2024-04-01', 'GeographicZone_ID': zone_id, 'PressureValue': 1.0},
+        {'Date': '2024-04-02', 'GeographicZone_ID': zone_id, 'PressureValue': 1.0},
+    ]).status_code == 201
+    response = client.post('/pressure/batch', json=[
+        {'Date': '2024-04-01', 'GeographicZone_ID': zone_id},
+        {'Date': '2024-04-02', 'GeographicZone_ID': zone_id, 'PressureValue': 9.0},
+    ])
+    assert response.status_code == 201
+    values = {row['Date']: row['PressureValue'] for row in client.get('/pressure').json['items']}
+    # A column left out of an item keeps its stored value
+    assert values == {'2024-04-01': 1.0, '2024-04-02': 9.0}
+
+
+def test_component_writes_require_zone(client):
+    zone_id = add_zone(client)
+    assert client.post('/wind', json=WIND).status_code == 400
+    response = client.post('/wind/batch', json=[{**WIND, 'GeographicZone_ID': zone_id}, WIND])
+    assert response.status_code == 400
+    assert response.json['results'][1]['errors'] == {'GeographicZone_ID': ['Missing data for required field.']}
+    for _ in range(3):
+        add_wind(client, zone_id)
+    assert len(client.get('/wind').json['items']) == 1
+
+
+def test_replica_marked_down_sends_reads_to_primary(replica_app):
+    client = replica_app.test_client()
+    add_zone(client)
+    replicas = replica_app.extensions['replicas']
+    replicas.mark_down('replica_0')
+    assert len(client.get('/geographiczone').json['items']) == 1
+    replicas.check()
+    assert replicas.status() == {'replica_0': True}
+    assert client.get('/geographiczone').json['items'] == []
+
+
+def test_hung_replica_check_does_not_block_requests(replica_app):
+    replicas = replica_app.extensions['replicas']
+    release = threading.Event()
+    replicas.ping = lambda name, engine: release.wait(5) and False
+    checker = threading.Thread(target=replicas.check)
+    checker.start()
+    try:
+        start = time.monotonic()
+        assert replica_app.test_client().get('/geographiczone').status_code == 200
+        assert time.monotonic() - start < 1
+    finally:
+        release.set()
+        checker.join()
+    assert replicas.status() == {'replica_0': False}
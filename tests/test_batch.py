@@ -0,0 +1,59 @@
+def add_zone(client, name='Test'):
+    return client.post('/geographiczone', json={'Zone_Name': name}).json['GeographicZone_ID']
+
+
+def winds(client):
+    return {row['Date']: row['Wind_Speed'] for row in client.get('/wind').json['items']}
+
+
+def test_batch_create_update_delete(client):
+    zone_id = add_zone(client)
+    response = client.post('/wind/batch', json=[{'Date': f'2024-01-0{day}', 'GeographicZone_ID': zone_id,
+                                                 'Wind_Speed': float(day)} for day in (1, 2, 3)])
+    assert response.status_code == 201
+    ids = [result['id'] for result in response.json['results']]
+    assert [result['status'] for result in response.json['results']] == ['upserted'] * 3
+
+    response = client.put('/wind/batch', json=[{'Wind_ID': ids[0], 'Wind_Speed': 9.0}])
+    assert response.status_code == 200
+    assert winds(client) == {'2024-01-01': 9.0, '2024-01-02': 2.0, '2024-01-03': 3.0}
+
+    response = client.delete('/wind/batch', json=[ids[1], {'Wind_ID': ids[2]}])
+    assert response.status_code == 200
+    assert winds(client) == {'2024-01-01': 9.0}
+
+
+def test_invalid_item_rejects_whole_batch(client):
+    zone_id = add_zone(client)
+    response = client.post('/wind/batch', json=[{'Date': '2024-01-01', 'GeographicZone_ID': zone_id},
+                                                {'Date': 'not a date', 'GeographicZone_ID': zone_id}])
+    assert response.status_code == 400
+    assert [result['status'] for result in response.json['results']] == ['skipped', 'error']
+    assert winds(client) == {}
+
+
+def test_missing_ids_reject_update_and_delete(client):
+    zone_id = add_zone(client)
+    wind_id = client.post('/wind', json={'Date': '2024-01-01', 'GeographicZone_ID': zone_id}).json['Wind_ID']
+    response = client.put('/wind/batch', json=[{'Wind_ID': wind_id, 'Wind_Speed': 5.0}, {'Wind_ID': 999}])
+    assert response.status_code == 404
+    assert [result['status'] for result in response.json['results']] == ['skipped', 'not_found']
+    assert client.delete('/wind/batch', json=[wind_id, 999]).status_code == 404
+    assert winds(client) == {'2024-01-01': None}
+
+
+def test_constraint_violation_rolls_back_batch(client):
+    zone_id = add_zone(client)
+    ids = [result['id'] for result in client.post('/wind/batch', json=[
+        {'Date': '2024-01-01', 'GeographicZone_ID': zone_id},
+        {'Date': '2024-01-02', 'GeographicZone_ID': zone_id}]).json['results']]
+    response = client.put('/wind/batch', json=[{'Wind_ID': ids[0], 'Wind_Speed': 5.0},
+                                               {'Wind_ID': ids[1], 'Date': '2024-01-01'}])
+    assert response.status_code == 409
+    assert winds(client) == {'2024-01-01': None, '2024-01-02': None}
+
+
+def test_batch_limits(client):
+    assert client.post('/wind/batch', json=[]).status_code == 400
+    assert client.post('/wind/batch', json={'Date': '2024-01-01'}).status_code == 400
+    assert client.delete('/wind/batch', json=['1']).status_code == 400
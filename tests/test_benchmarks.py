@@ -0,0 +1,38 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+
+# Run a benchmark script in its own process (it configures the database before importing prueba)
+def run(script, *args):
+    result = subprocess.run([sys.executable, str(ROOT / script), *args], cwd=ROOT, capture_output=True, text=True,
+                            timeout=120)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def test_endpoint_benchmark_report(tmp_path):
+    output = tmp_path / 'report.json'
+    run('bench_endpoints.py', '--db', str(tmp_path / 'bench.db'), '--zones', '2', '--days', '30',
+        '--occurrences', '50', '--requests', '300', '--write-ratio', '0.5', '--output', str(output))
+    report = json.loads(output.read_text())
+    assert report['config']['requests'] == report['total']['requests'] == 300
+    assert report['total']['errors'] == 0
+    routes = report['routes']
+    assert sum(route['requests'] for route in routes.values()) == 300
+    for label in ('POST /weathermeasurement', 'GET /wind/<id>', 'PUT /pressure/<id>', 'DELETE /vegetation/<id>'):
+        assert label in routes
+    for label, route in routes.items():
+        assert route['p50_ms'] <= route['p95_ms'] <= route['p99_ms']
+        # Reads may be answered from the caches, writes always reach the database
+        if not label.startswith('GET'):
+            assert route['queries_per_request'] > 0
+
+
+def test_serializer_benchmark_checks_output():
+    results = json.loads(run('bench_serializers.py', '--sizes', '200', '--repeat', '1', '--json'))
+    assert [(result['table'], result['rows']) for result in results] == [('wind', 200), ('weather_measurement', 200)]
+    assert all(result['bytes'] > 0 for result in results)
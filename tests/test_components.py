@@ -0,0 +1,51 @@
+from datetime import date
+
+from prueba import GeographicZone, Humidity, Precipitation, Pressure, Wind, component_cache, db, resolve_components
+
+DAY = date(2024, 1, 1)
+
+
+def add_components(zone_name='Test'):
+    zone = GeographicZone(Zone_Name=zone_name)
+    db.session.add(zone)
+    db.session.flush()
+    db.session.add_all(model(Date=DAY, GeographicZone_ID=zone.GeographicZone_ID)
+                       for model in (Wind, Pressure, Humidity, Precipitation))
+    db.session.commit()
+    return zone.GeographicZone_ID
+
+
+def test_component_cache_is_invalidated_at_commit(app):
+    with app.app_context():
+        zone_id = add_components()
+        ids = resolve_components(DAY, zone_id)
+        assert ids is not None
+        db.session.delete(db.session.get(Wind, ids[0]))
+        db.session.flush()
+        # Other requests keep reading the committed IDs until the delete commits
+        assert component_cache.get((DAY, zone_id)) == ids
+        db.session.commit()
+        assert component_cache.get((DAY, zone_id)) is None
+        assert resolve_components(DAY, zone_id) is None
+
+
+def test_rolled_back_write_keeps_component_cache(app):
+    with app.app_context():
+        zone_id = add_components()
+        ids = resolve_components(DAY, zone_id)
+        db.session.delete(db.session.get(Wind, ids[0]))
+        db.session.flush()
+        db.session.rollback()
+        assert component_cache.get((DAY, zone_id)) == ids
+        db.session.commit()
+        assert component_cache.get((DAY, zone_id)) == ids
+
+
+def test_bulk_component_write_clears_component_cache(app):
+    with app.app_context():
+        zone_id = add_components()
+        ids = resolve_components(DAY, zone_id)
+        db.session.execute(db.delete(Wind).where(Wind.Wind_ID == ids[0]))
+        assert component_cache.get((DAY, zone_id)) == ids
+        db.session.commit()
+        assert component_cache.get((DAY, zone_id)) is None
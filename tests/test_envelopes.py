@@ -0,0 +1,37 @@
+import pytest
+
+from conftest import gbif_zip, ingest_sample
+from prueba import ingest_gbif
+
+np = pytest.importorskip('numpy')
+
+LOCATION = {'decimalLatitude': '-4.9453', 'decimalLongitude': '-79.0319'}
+
+
+def occurrence(gbif_id, day, taxon_key, species, family='Myristicaceae'):
+    return {'gbifID': str(gbif_id), 'eventDate': day, 'taxonKey': str(taxon_key), 'species': species,
+            'scientificName': species, 'family': family, **LOCATION}
+
+
+def test_envelopes_use_only_the_referenced_measurements(app, client):
+    ingest_sample(app)
+    with app.app_context():
+        ingest_gbif(gbif_zip([occurrence(1, '2024-11-29', 10, 'Virola a'), occurrence(2, '2024-11-30', 10, 'Virola a'),
+                              occurrence(3, '2024-11-30', 20, 'Virola b')]))
+    result = client.get('/analytics/climate-envelopes?percentiles=50').json
+    assert result['occurrences'] == result['matched'] == 3
+    assert result['measurements'] == 2  # not the 30 days of the zone
+    groups = {group['name']: group for group in result['groups']}
+    # T2M_MAX of 2024-11-29 and 2024-11-30 in prueba.csv
+    assert groups['Virola a']['climate']['Max_Temperature_2m'] == {'p50': round((22.77 + 22.69) / 2, 3), 'count': 2}
+    assert groups['Virola b']['climate']['Max_Temperature_2m'] == {'p50': 22.69, 'count': 1}
+    assert groups['Virola a']['climate']['SurfaceSoilWetness'] is None  # -999 in the file
+
+
+def test_envelopes_date_range(app, client):
+    ingest_sample(app)
+    with app.app_context():
+        ingest_gbif(gbif_zip([occurrence(1, '2024-11-29', 10, 'Virola a'), occurrence(2, '2024-11-30', 20, 'Virola b')]))
+    result = client.get('/analytics/climate-envelopes?from=2024-11-30&group=family').json
+    assert result['occurrences'] == 1
+    assert [group['name'] for group in result['groups']] == ['Myristicaceae']
@@ -0,0 +1,57 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from conftest import ingest_sample
+from prueba import db
+
+
+# Statements sent to the database inside the block
+@contextmanager
+def statements(app):
+    sent = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        sent.append(statement)
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield sent
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+def test_expanded_page_is_one_query(app, client):
+    zone_id = ingest_sample(app)
+    with statements(app) as sent:
+        page = client.get('/weathermeasurement?expand=all&limit=20').json
+    assert len(page['items']) == 20
+    assert len(sent) == 1
+    item = page['items'][0]
+    assert item['geographic_zone']['GeographicZone_ID'] == zone_id
+    assert item['wind']['Date'] == item['precipitation']['Date'] == item['Date']
+
+
+def test_expand_only_the_requested_relations(app, client):
+    ingest_sample(app)
+    item = client.get('/weathermeasurement?expand=wind,pressure&limit=1').json['items'][0]
+    assert 'wind' in item and 'pressure' in item
+    assert 'humidity' not in item and 'geographic_zone' not in item
+    assert 'wind' not in client.get('/weathermeasurement?limit=1').json['items'][0]
+
+
+def test_expanded_record(app, client):
+    ingest_sample(app)
+    measurement_id = client.get('/weathermeasurement?limit=1').json['items'][0]['ClimateMeasurement_ID']
+    with statements(app) as sent:
+        record = client.get(f'/weathermeasurement/{measurement_id}?expand=humidity').json
+    assert len(sent) == 1
+    assert record['humidity']['Date'] == record['Date']
+    assert client.get('/weathermeasurement/999999?expand=humidity').status_code == 404
+
+
+def test_unknown_relation_is_rejected(client):
+    response = client.get('/weathermeasurement?expand=wind,soil')
+    assert response.status_code == 400
+    assert response.json == {'error': 'Unknown relation(s) to expand: soil'}
+    assert client.get('/vegetation/1?expand=humidity').status_code == 400
@@ -0,0 +1,56 @@
+import io
+from datetime import date
+
+import pytest
+
+from conftest import ingest_sample
+
+np = pytest.importorskip('numpy')
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+
+def test_arrow_export_streams_every_measurement(app, client):
+    zone_id = ingest_sample(app)
+    response = client.get('/weathermeasurement/export')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/vnd.apache.arrow.stream'
+    table = pa.ipc.open_stream(response.data).read_all()
+    assert table.num_rows == 30
+    assert set(table.column('GeographicZone_ID').to_pylist()) == {zone_id}
+    # T2M_MAX of 2024-11-30 in prueba.csv
+    assert table.column('Date')[-1].as_py() == date(2024, 11, 30)
+    assert table.column('Max_Temperature_2m')[-1].as_py() == 22.69
+
+
+def test_parquet_and_npz_exports_match_arrow(app, client):
+    ingest_sample(app)
+    arrow = pa.ipc.open_stream(client.get('/weathermeasurement/export?format=arrow').data).read_all()
+    parquet = pq.read_table(io.BytesIO(client.get('/weathermeasurement/export?format=parquet').data))
+    assert parquet.equals(arrow)
+    npz = np.load(io.BytesIO(client.get('/weathermeasurement/export?format=npz').data))
+    assert npz['ClimateMeasurement_ID'].tolist() == arrow.column('ClimateMeasurement_ID').to_pylist()
+    assert npz['Date'].dtype == np.dtype('datetime64[D]')
+
+
+def test_export_filters(app, client):
+    zone_id = ingest_sample(app)
+    response = client.get(f'/weathermeasurement/export?zone={zone_id}&from=2024-11-10&to=2024-11-19')
+    table = pa.ipc.open_stream(response.data).read_all()
+    assert table.column('Date').to_pylist() == [date(2024, 11, day) for day in range(10, 20)]
+    empty = pa.ipc.open_stream(client.get(f'/weathermeasurement/export?zone={zone_id + 1}').data).read_all()
+    assert empty.num_rows == 0
+
+
+def test_export_rejects_bad_parameters(client):
+    assert client.get('/weathermeasurement/export?format=csv').status_code == 400
+    assert client.get('/weathermeasurement/export?from=10-11-2024').status_code == 400
+
+
+def test_export_command_uses_output_extension(app, tmp_path):
+    ingest_sample(app)
+    output = tmp_path / 'weather.parquet'
+    result = app.test_cli_runner().invoke(args=['export-weather', str(output), '--from', '2024-11-29',
+                                                '--chunk-size', '1'])
+    assert result.exit_code == 0, result.output
+    assert pq.read_table(output).column('Date').to_pylist() == [date(2024, 11, 29), date(2024, 11, 30)]
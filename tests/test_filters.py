@@ -0,0 +1,75 @@
+import json
+
+from conftest import ingest_sample
+
+
+def add_zone(client, name, latitude):
+    response = client.post('/geographiczone', json={'Zone_Name': name, 'Latitude': latitude, 'Longitude': 2.0})
+    return response.json['GeographicZone_ID']
+
+
+# ----------------------- ?fields= -----------------------
+
+def test_fields_select_columns_and_keep_the_cursor(app, client):
+    ingest_sample(app)
+    page = client.get('/wind?fields=Date,Wind_Speed&limit=2').json
+    assert [set(item) for item in page['items']] == [{'Date', 'Wind_Speed'}] * 2
+    assert page['items'][0]['Date'] == '2024-11-01'
+    # The primary key is read for the cursor without being sent
+    rest = client.get(f"/wind?fields=Date&after={page['next_after']}&limit=100").json
+    assert rest['items'][0] == {'Date': '2024-11-03'}
+    assert len(rest['items']) == 28 and rest['next_after'] is None
+
+
+def test_fields_on_streams_and_the_schema_path(app, client):
+    ingest_sample(app)
+    lines = client.get('/pressure?fields=PressureValue&stream=ndjson').get_data(as_text=True).splitlines()
+    assert len(lines) == 30 and set(json.loads(lines[0])) == {'PressureValue'}
+    fast = client.get('/weathermeasurement?fields=Date,Cloud_Amount&limit=5').json
+    app.json.compact = False
+    assert client.get('/weathermeasurement?fields=Date,Cloud_Amount&limit=5').json == fast
+    # Expanded relations stay nested next to the selected columns
+    item = client.get('/weathermeasurement?fields=Date&expand=wind&limit=1').json['items'][0]
+    assert set(item) == {'Date', 'wind'} and item['wind']['Date'] == item['Date']
+
+
+def test_unknown_field_is_rejected(client):
+    response = client.get('/wind?fields=Date,Speed')
+    assert response.status_code == 400
+    assert response.json == {'error': 'Unknown field(s): Speed'}
+    assert client.get('/weathermeasurement?fields=wind&expand=wind').status_code == 400
+
+
+# ----------------------- ?from=, ?to= and foreign keys -----------------------
+
+def test_date_range(app, client):
+    ingest_sample(app)
+    items = client.get('/humidity?from=2024-11-10&to=2024-11-12').json['items']
+    assert [item['Date'] for item in items] == ['2024-11-10', '2024-11-11', '2024-11-12']
+    assert len(client.get('/weathermeasurement?from=2024-11-29').json['items']) == 2
+    assert len(client.get('/precipitation?to=2024-11-05&stream=json').json) == 5
+
+
+def test_foreign_key_filters(app, client):
+    zone_id = ingest_sample(app)
+    other_id = add_zone(client, 'Other', 5.0)
+    client.post('/wind', json={'Date': '2024-11-01', 'GeographicZone_ID': other_id, 'Wind_Speed': 1.0})
+    def count(query):
+        return len(client.get(f'/wind?limit=100&{query}').json['items'])
+    assert count(f'GeographicZone_ID={zone_id}') == 30
+    assert count(f'GeographicZone_ID={other_id}') == 1
+    assert count(f'GeographicZone_ID={zone_id},{other_id}') == 31
+    assert count(f'GeographicZone_ID={other_id}&from=2024-11-02') == 0
+    wind_id = client.get(f'/wind?from=2024-11-05&to=2024-11-05&GeographicZone_ID={zone_id}').json['items'][0]['Wind_ID']
+    assert [item['Date'] for item in client.get(f'/weathermeasurement?Wind_ID={wind_id}').json['items']] == ['2024-11-05']
+    assert client.get('/weathermeasurement?Wind_ID=999999').json['items'] == []
+
+
+def test_invalid_filters(client):
+    assert client.get('/wind?from=01-11-2024').json == {'error': 'Invalid date format. Use YYYY-MM-DD.'}
+    response = client.get('/geographiczone?from=2024-11-01')
+    assert response.status_code == 400
+    assert response.json == {'error': 'from is not supported on geographic_zone'}
+    response = client.get('/wind?GeographicZone_ID=1,x')
+    assert response.status_code == 400
+    assert response.json == {'error': 'GeographicZone_ID must be an integer or a comma separated list of integers'}
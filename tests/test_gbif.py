@@ -0,0 +1,67 @@
+from pathlib import Path
+
+from conftest import gbif_zip, ingest_sample
+from prueba import GeographicZone, Taxon, Vegetation, WeatherMeasurement, db, ingest_gbif
+
+SHIPPED_ZIP = Path(__file__).parent.parent / '0023596-241126133413365.zip'
+AT_ZONE = {'decimalLatitude': '-4.9453', 'decimalLongitude': '-79.0319'}
+NEAR_ZONE = {'decimalLatitude': '-4.95', 'decimalLongitude': '-79.04'}  # about 1 km away
+
+
+def occurrence(gbif_id, day='2024-11-05', taxon_key='5564567', **values):
+    return {'gbifID': str(gbif_id), 'eventDate': day, 'taxonKey': taxon_key, 'species': 'Virola sp.', **AT_ZONE, **values}
+
+
+def load(app, occurrences, **options):
+    with app.app_context():
+        return ingest_gbif(gbif_zip(occurrences), **options)
+
+
+def test_matched_occurrences_are_linked_to_their_measurement(app):
+    zone_id = ingest_sample(app)
+    summary = load(app, [occurrence(1), occurrence(2, day='2024-11-05T10:00/2024-11-06'),
+                         occurrence(3, decimalLatitude=''), occurrence(4, day='')])
+    assert (summary['inserted'], summary['skipped'], summary['taxa_created']) == (2, 2, 1)
+    with app.app_context():
+        measurement = WeatherMeasurement.query.filter_by(Date='2024-11-05').one()
+        rows = Vegetation.query.order_by(Vegetation.Gbif_ID).all()
+        assert [(row.Gbif_ID, row.ClimateMeasurement_ID, row.Wind_ID, row.GeographicZone_ID) for row in rows] == \
+            [(1, measurement.ClimateMeasurement_ID, measurement.Wind_ID, zone_id),
+             (2, measurement.ClimateMeasurement_ID, measurement.Wind_ID, zone_id)]
+
+
+def test_reload_updates_by_gbif_id(app):
+    ingest_sample(app)
+    load(app, [occurrence(1)])
+    summary = load(app, [occurrence(1, taxonKey='', species='Other')])
+    assert summary['inserted'] == 1
+    with app.app_context():
+        assert [(row.Taxon_ID, row.Vegetation_Type) for row in Vegetation.query] == [(None, 'Other')]
+
+
+def test_unknown_coordinates_create_no_zones_or_taxa(app):
+    ingest_sample(app)
+    summary = load(app, [occurrence(1, taxon_key='1', **NEAR_ZONE), occurrence(2, taxon_key='2', day='2020-01-01')])
+    assert (summary['inserted'], summary['unmatched'], summary['taxa_created']) == (0, 2, 0)
+    with app.app_context():
+        assert GeographicZone.query.count() == 1
+        assert Taxon.query.count() == 0
+
+
+def test_snap_km_attaches_to_nearest_zone(app):
+    zone_id = ingest_sample(app)
+    assert load(app, [occurrence(1, **NEAR_ZONE)], snap_km=0.5)['inserted'] == 0
+    assert load(app, [occurrence(1, **NEAR_ZONE)], snap_km=5)['inserted'] == 1
+    with app.app_context():
+        assert db.session.scalar(db.select(Vegetation.GeographicZone_ID)) == zone_id
+
+
+def test_shipped_download_without_matching_weather(app, client):
+    with open(SHIPPED_ZIP, 'rb') as f:
+        response = client.post('/ingest/gbif', data={'file': (f, SHIPPED_ZIP.name)})
+    assert response.status_code == 201
+    summary = response.json
+    assert summary['rows'] == summary['skipped'] + summary['unmatched']
+    assert (summary['inserted'], summary['taxa_created']) == (0, 0)
+    with app.app_context():
+        assert GeographicZone.query.count() == 0
@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+
+from sqlalchemy import func, select
+
+from conftest import SAMPLE_CSV, make_app
+from prueba import WeatherMeasurement, create_app, db
+
+
+# Temporary upload file, as queue_ingest writes it
+def upload(tmp_path, name='upload.csv'):
+    path = tmp_path / name
+    path.write_text('data')
+    return str(path)
+
+
+def wait(jobs, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = jobs.get(job_id)
+        if job['finished']:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f'job {job_id} did not finish')
+
+
+def wait_all(jobs):
+    return [wait(jobs, job['id']) for job in jobs.list()]
+
+
+# Load that reports one chunk, then waits for `release` and reports a second one
+def blocking_load(started, release, calls):
+    def load(path, progress):
+        calls.append(path)
+        progress({'rows': 1})
+        started.set()
+        release.wait(10)
+        progress({'rows': 2})
+        return {'rows': 2}
+    return load
+
+
+def test_nasa_power_job_runs_in_the_background(app, client):
+    with open(SAMPLE_CSV, 'rb') as f:
+        response = client.post('/jobs/ingest/nasapower', data={'file': (f, 'prueba.csv')})
+    assert response.status_code == 202
+    job_id = response.json['id']
+    assert response.headers['Location'] == f'/jobs/{job_id}'
+    with app.app_context():
+        job = wait(app.extensions['ingest_jobs'], job_id)
+        assert db.session.scalar(select(func.count()).select_from(WeatherMeasurement)) == 30
+    assert (job['status'], job['kind'], job['filename'], job['error']) == ('done', 'nasapower', 'prueba.csv', None)
+    assert client.get(f'/jobs/{job_id}').json['progress'] == job['progress']
+    assert [item['id'] for item in client.get('/jobs').json] == [job_id]
+    assert client.delete(f'/jobs/{job_id}').status_code == 409
+    assert client.get('/jobs/unknown').status_code == 404
+
+
+def test_failed_job_reports_error(app, tmp_path):
+    def load(path, progress):
+        raise ValueError('bad file')
+    with app.app_context():
+        jobs = app.extensions['ingest_jobs']
+        job = wait(jobs, jobs.submit('nasapower', None, upload(tmp_path), load)['id'])
+    assert (job['status'], job['error']) == ('failed', 'bad file')
+    assert not os.path.exists(tmp_path / 'upload.csv')
+
+
+def test_cancel_queued_and_running_jobs(tmp_path):
+    app = make_app(tmp_path, INGEST_WORKERS=1)
+    started, release, calls = threading.Event(), threading.Event(), []
+    with app.app_context():
+        jobs = app.extensions['ingest_jobs']
+        running = jobs.submit('nasapower', None, upload(tmp_path, 'first.csv'), blocking_load(started, release, calls))
+        assert started.wait(10)
+        queued = jobs.submit('nasapower', None, upload(tmp_path, 'second.csv'), blocking_load(started, release, calls))
+        client = app.test_client()
+        assert client.delete(f"/jobs/{queued['id']}").json['status'] == 'cancelled'
+        assert client.delete(f"/jobs/{running['id']}").json['status'] == 'running'
+        release.set()
+        jobs.executor.shutdown(wait=True)
+        running, queued = jobs.get(running['id']), jobs.get(queued['id'])
+    # The running load stops at its next chunk and the queued one never starts
+    assert (running['status'], running['progress']) == ('cancelled', {'rows': 2})
+    assert queued['status'] == 'cancelled' and queued['started'] is None
+    assert calls == [str(tmp_path / 'first.csv')]
+    assert not os.path.exists(tmp_path / 'second.csv')
+
+
+def test_cancel_from_another_process(app, tmp_path):
+    started, release, calls = threading.Event(), threading.Event(), []
+    with app.app_context():
+        jobs = app.extensions['ingest_jobs']
+        job_id = jobs.submit('gbif', None, upload(tmp_path), blocking_load(started, release, calls))['id']
+    assert started.wait(10)
+    # A second app on the same database stands in for another worker process
+    other = create_app({**app.config, 'SQLALCHEMY_BINDS': {}})
+    try:
+        assert other.test_client().delete(f'/jobs/{job_id}').status_code == 202
+    finally:
+        release.set()
+        with other.app_context():
+            db.engine.dispose()
+    with app.app_context():
+        assert wait(jobs, job_id)['status'] == 'cancelled'
+
+
+def test_full_queue_is_rejected(tmp_path):
+    app = make_app(tmp_path, INGEST_WORKERS=1, INGEST_QUEUE_SIZE=1)
+    started, release, calls = threading.Event(), threading.Event(), []
+    client = app.test_client()
+    try:
+        with app.app_context():
+            jobs = app.extensions['ingest_jobs']
+            jobs.submit('nasapower', None, upload(tmp_path, 'first.csv'), blocking_load(started, release, calls))
+            assert started.wait(10)
+            assert jobs.submit('nasapower', None, upload(tmp_path, 'second.csv'), blocking_load(started, release, calls))
+        response = client.post('/jobs/ingest/nasapower', data=b'x')
+        assert response.status_code == 503
+    finally:
+        release.set()
+    with app.app_context():
+        assert [job['status'] for job in wait_all(jobs)] == ['done', 'done']
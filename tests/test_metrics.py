@@ -0,0 +1,49 @@
+import logging
+import re
+
+from conftest import make_app
+
+
+def add_zone(client):
+    return client.post('/geographiczone', json={'Zone_Name': 'Test', 'Latitude': 1.0, 'Longitude': 2.0})
+
+
+# Value of the sample with exactly these labels in the Prometheus text
+def sample(text, name, labels=''):
+    match = re.search(rf'^{re.escape(name)}{re.escape(labels)} (\S+)$', text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+def test_metrics_count_requests_and_statements(client):
+    zone_id = add_zone(client).json['GeographicZone_ID']
+    for _ in range(2):
+        response = client.get(f'/geographiczone/{zone_id}')
+        assert response.status_code == 200
+        assert 'Server-Timing' not in response.headers
+    assert client.get('/geographiczone/999999').status_code == 404
+    text = client.get('/metrics').get_data(as_text=True)
+    labels = '{method="GET",route="/geographiczone/<int:zone_id>",status="200"}'
+    assert sample(text, 'http_request_duration_seconds_count', labels) == 2
+    assert sample(text, 'http_request_duration_seconds_bucket', labels[:-1] + ',le="+Inf"}') == 2
+    assert sample(text, 'http_request_duration_seconds_count', labels.replace('200', '404')) == 1
+    assert sample(text, 'db_statements_total', '{method="POST",route="/geographiczone"}') > 0
+
+
+def test_server_timing_header(tmp_path):
+    client = make_app(tmp_path, SERVER_TIMING=True).test_client()
+    header = client.get('/geographiczone').headers['Server-Timing']
+    assert re.fullmatch(r'db;dur=[\d.]+;desc="1 queries", app;dur=[\d.]+', header)
+
+
+def test_slow_query_log(tmp_path, caplog):
+    client = make_app(tmp_path, SLOW_QUERY_MS=0).test_client()
+    with caplog.at_level(logging.WARNING, logger='prueba.slow_query'):
+        client.get('/geographiczone')
+    assert any('/geographiczone SELECT' in record.getMessage() for record in caplog.records)
+    assert sample(client.get('/metrics').get_data(as_text=True), 'db_slow_queries_total') >= 1
+
+
+def test_metrics_disabled(tmp_path):
+    client = make_app(tmp_path, METRICS_ENABLED=False, SERVER_TIMING=True).test_client()
+    assert client.get('/metrics').status_code == 404
+    assert 'Server-Timing' not in client.get('/geographiczone').headers
@@ -0,0 +1,55 @@
+from datetime import date
+
+import pytest
+
+from conftest import SAMPLE_CSV
+from prueba import Humidity, WeatherMeasurement, Wind, db, parse_nasa_power
+
+
+def test_parse_header_and_rows():
+    with open(SAMPLE_CSV, encoding='utf-8') as f:
+        meta, records = parse_nasa_power(f)
+        records = list(records)
+    assert (meta['latitude'], meta['longitude'], meta['elevation']) == (-4.9453, -79.0319, 1414.13)
+    assert meta['parameters'] == ['PRECTOTCORR', 'GWETTOP', 'GWETROOT', 'GWETPROF', 'WS2M_MAX', 'WS2M_MIN',
+                                  'T2M_MAX', 'T2M_MIN', 'PS']
+    assert len(records) == 30
+    # 2024,306: day of year 306 of a leap year
+    assert records[0]['Date'] == date(2024, 11, 1)
+    assert records[-1]['Date'] == date(2024, 11, 30)
+    assert records[0]['GWETTOP'] is None  # -999
+    assert records[0]['PS'] == 85.67
+
+
+def test_parse_month_day_columns_without_header():
+    meta, records = parse_nasa_power(['YEAR,MO,DY,WS2M,T2M_MAX\n', '2023,2,28,1.5,-999\n', '\n'])
+    assert meta['latitude'] is None
+    assert list(records) == [{'Date': date(2023, 2, 28), 'WS2M': 1.5, 'T2M_MAX': None}]
+
+
+def test_parse_rejects_files_without_dates():
+    with pytest.raises(ValueError):
+        parse_nasa_power(['LAT,LON,T2M\n'])
+
+
+def test_ingest_endpoint_is_idempotent(app, client):
+    for _ in range(2):
+        with open(SAMPLE_CSV, 'rb') as f:
+            response = client.post('/ingest/nasapower', data=f.read())
+        assert response.status_code == 201
+        assert response.json['rows'] == 30
+    with app.app_context():
+        assert db.session.query(WeatherMeasurement).count() == 30
+        assert db.session.query(Humidity).count() == 30
+        first = db.session.query(Wind).order_by(Wind.Date).first()
+        # No WS2M column: the midpoint of WS2M_MAX 0.72 and WS2M_MIN 0.26
+        assert first.Wind_Speed == pytest.approx(0.49)
+
+
+def test_ingest_without_location_needs_zone(client):
+    response = client.post('/ingest/nasapower', data=b'YEAR,DOY,T2M_MAX\n2024,1,20\n')
+    assert response.status_code == 400
+    zone_id = client.post('/geographiczone', json={'Zone_Name': 'Test'}).json['GeographicZone_ID']
+    response = client.post(f'/ingest/nasapower?GeographicZone_ID={zone_id}', data=b'YEAR,DOY,T2M_MAX\n2024,1,20\n')
+    assert response.status_code == 201
+    assert client.get('/weathermeasurement').json['items'][0]['Max_Temperature_2m'] == 20
@@ -0,0 +1,62 @@
+from sqlalchemy import event
+
+from conftest import ingest_sample, make_app
+from prueba import db
+
+
+def recent(client, zone_id, days=30):
+    response = client.get(f'/zone/{zone_id}/recent?days={days}')
+    assert response.status_code == 200
+    return response.json['items']
+
+
+def test_recent_window_matches_measurements(app, client):
+    zone_id = ingest_sample(app)
+    items = recent(client, zone_id, 3)
+    assert [item['Date'] for item in items] == ['2024-11-28', '2024-11-29', '2024-11-30']
+    assert items[-1]['Max_Temperature_2m'] == 22.69
+    assert items[-1]['SurfaceSoilWetness'] is None  # -999 in the file
+
+
+def test_recent_follows_writes_of_the_same_app(app, client):
+    zone_id = ingest_sample(app)
+    assert recent(client, zone_id)[0]['Max_Temperature_2m'] != 99
+    assert client.put('/update_weathermeasurement/1', json={'Max_Temperature_2m': 99}).status_code == 200
+    assert recent(client, zone_id)[0]['Max_Temperature_2m'] == 99
+
+
+def test_recent_picks_up_writes_of_other_workers_after_ttl(tmp_path):
+    writer = make_app(tmp_path)
+    zone_id = ingest_sample(writer)
+    stale = make_app(tmp_path, RECENT_TTL=3600)
+    fresh = make_app(tmp_path, RECENT_TTL=0)
+    for app in (stale, fresh):
+        assert recent(app.test_client(), zone_id)[0]['Max_Temperature_2m'] != 99
+    writer.test_client().put('/update_weathermeasurement/1', json={'Max_Temperature_2m': 99})
+    assert recent(fresh.test_client(), zone_id)[0]['Max_Temperature_2m'] == 99
+    assert recent(stale.test_client(), zone_id)[0]['Max_Temperature_2m'] != 99
+
+
+def test_zone_without_measurements_is_cached_as_miss(app, client):
+    ingest_sample(app)
+    recent(client, 999)
+    statements = []
+    with app.app_context():
+        engine = db.engine
+
+    def listener(connection, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(engine, 'before_cursor_execute', listener)
+    try:
+        assert recent(client, 999) == []
+    finally:
+        event.remove(engine, 'before_cursor_execute', listener)
+    assert statements == []
+    assert client.get('/zone/recent/stats').json['missing_zones'] == 1
+
+
+def test_miss_is_forgotten_when_the_zone_gets_data(app, client):
+    assert recent(client, 1) == []
+    zone_id = ingest_sample(app)
+    assert zone_id == 1
+    assert len(recent(client, zone_id)) == 30
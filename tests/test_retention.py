@@ -0,0 +1,115 @@
+import json
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from conftest import gbif_zip, ingest_sample, make_app
+from prueba import (RETENTION_TABLES, Wind, WeatherMeasurement, apply_retention, db, ingest_gbif,
+                    retention_policy)
+
+# With keep_days 1 and monthly periods, running on 2024-12-02 compacts all of November (prueba.csv)
+POLICY = {table: {'keep_days': 1} for table in RETENTION_TABLES}
+AS_OF = date(2024, 12, 2)
+
+
+def wind_speeds(app):
+    with app.app_context():
+        return db.session.scalars(select(Wind.Wind_Speed).order_by(Wind.Date)).all()
+
+
+def archive(client, table, **params):
+    query = '&'.join(f'{name}={value}' for name, value in {'table': table, **params}.items())
+    response = client.get(f'/archive?{query}')
+    assert response.status_code == 200
+    return response.json
+
+
+def test_policy_overrides_and_validation():
+    policy = retention_policy({'wind': {'keep_days': 730}, 'humidity': {'granularity': 'year'}})
+    assert policy['wind'] == {'keep_days': 730, 'granularity': 'month'}
+    assert policy['humidity']['granularity'] == 'year'
+    assert policy['pressure'] == {'keep_days': 5 * 365 + 1, 'granularity': 'month'}
+    for overrides in ({'soil': {}}, {'wind': {'granularity': 'day'}}, {'wind': {'keep_days': 0}}):
+        with pytest.raises(ValueError):
+            retention_policy(overrides)
+
+
+def test_old_rows_are_compacted_and_deleted(tmp_path):
+    app = make_app(tmp_path, RETENTION_POLICY=POLICY)
+    zone_id = ingest_sample(app)
+    speeds = [speed for speed in wind_speeds(app) if speed is not None]
+    result = app.test_cli_runner().invoke(args=['apply-retention', '--as-of', AS_OF.isoformat(), '--json'])
+    assert result.exit_code == 0, result.output
+    report = json.loads(result.output)
+    assert {table: item['rows_deleted'] for table, item in report.items()} == dict.fromkeys(RETENTION_TABLES, 30)
+    assert report['wind']['cutoff'] == '2024-12-01'
+    with app.app_context():
+        assert db.session.scalar(select(func.count()).select_from(WeatherMeasurement)) == 0
+    [speed] = archive(app.test_client(), 'wind', zone=zone_id)
+    assert (speed['Period_Start'], speed['Metric'], speed['Row_Count']) == ('2024-11-01', 'Wind_Speed', 30)
+    assert speed['Value_Count'] == len(speeds)
+    assert speed['Mean'] == pytest.approx(sum(speeds) / len(speeds))
+    assert (speed['Min_Value'], speed['Max_Value']) == (min(speeds), max(speeds))
+    # Wind_Direction has no meaningful mean and is not archived
+    assert archive(app.test_client(), 'wind', metric='Wind_Direction') == []
+
+
+def test_referenced_rows_are_kept(app):
+    ingest_sample(app)
+    with app.app_context():
+        ingest_gbif(gbif_zip([{'gbifID': '1', 'eventDate': '2024-11-05', 'taxonKey': '10', 'species': 'Virola a',
+                               'decimalLatitude': '-4.9453', 'decimalLongitude': '-79.0319'}]))
+        dry = apply_retention(retention_policy(POLICY), today=AS_OF, dry_run=True)
+        # Components are only freed as their measurements go
+        assert dry['weather_measurement']['rows_eligible'] == 29
+        assert dry['wind']['rows_eligible'] == 0
+        report = apply_retention(retention_policy(POLICY), today=AS_OF)
+        assert {table: item['rows_deleted'] for table, item in report.items()} == dict.fromkeys(RETENTION_TABLES, 29)
+        assert db.session.scalars(select(WeatherMeasurement.Date)).all() == [date(2024, 11, 5)]
+
+
+def test_batches_give_the_same_aggregates(tmp_path):
+    weekly = {'keep_days': 1, 'granularity': 'week'}
+    policy = retention_policy({'weather_measurement': weekly, 'wind': weekly})
+    results = []
+    for batch_size in (4, 5000):
+        (tmp_path / str(batch_size)).mkdir()
+        app = make_app(tmp_path / str(batch_size))
+        ingest_sample(app)
+        with app.app_context():
+            # Cutoff on Monday 2024-12-02, after the last week of November
+            report = apply_retention(policy, ['weather_measurement', 'wind'], today=date(2024, 12, 3),
+                                     batch_size=batch_size)['wind']
+        assert report['rows_deleted'] == 30
+        results.append((report['batches'], [{key: value for key, value in row.items() if key != 'Aggregate_ID'}
+                                            for row in archive(app.test_client(), 'wind')]))
+        with app.app_context():
+            db.engine.dispose()
+    (small_batches, small), (large_batches, large) = results
+    assert small_batches > large_batches == 1
+    assert small == large
+    # Weeks start on Monday; 2024-11-01 is a Friday
+    assert [row['Period_Start'] for row in large] == ['2024-10-28', '2024-11-04', '2024-11-11', '2024-11-18', '2024-11-25']
+
+
+def test_late_rows_are_merged_and_rollups_kept(app, client):
+    zone_id = ingest_sample(app)
+    policy = retention_policy(POLICY)
+    before = client.get(f'/weathermeasurement/rollup?zone={zone_id}&granularity=month').json
+    with app.app_context():
+        apply_retention(policy, today=AS_OF)
+    [first] = archive(client, 'wind', zone=zone_id)
+
+    assert client.post('/wind', json={'Date': '2024-11-20', 'GeographicZone_ID': zone_id,
+                                      'Wind_Speed': 100.0}).status_code == 201
+    # The rollup of a compacted period is not recomputed from the few daily rows left
+    assert client.get(f'/weathermeasurement/rollup?zone={zone_id}&granularity=month').json == before
+    with app.app_context():
+        assert apply_retention(policy, ['wind'], today=AS_OF)['wind']['rows_deleted'] == 1
+    [merged] = archive(client, 'wind', zone=zone_id)
+    assert merged['Aggregate_ID'] == first['Aggregate_ID']
+    assert (merged['Row_Count'], merged['Value_Count']) == (31, first['Value_Count'] + 1)
+    assert merged['Max_Value'] == 100.0
+    expected = (first['Mean'] * first['Value_Count'] + 100.0) / (first['Value_Count'] + 1)
+    assert merged['Mean'] == pytest.approx(expected)
@@ -0,0 +1,68 @@
+import pytest
+
+from conftest import ingest_sample
+from prueba import Pressure, Wind, WeatherRollup, db
+
+
+def month(client, zone_id):
+    response = client.get(f'/weathermeasurement/rollup?zone={zone_id}&granularity=month')
+    assert response.status_code == 200
+    [row] = response.json
+    return row
+
+
+def column_mean(app, model, column):
+    with app.app_context():
+        return db.session.scalar(db.select(db.func.avg(column)))
+
+
+def test_rollups_after_import(app, client):
+    zone_id = ingest_sample(app)
+    row = month(client, zone_id)
+    assert (row['Period_Start'], row['Measurement_Count']) == ('2024-11-01', 30)
+    assert row['Wind_Speed_Mean'] == pytest.approx(column_mean(app, Wind, Wind.Wind_Speed))
+    weeks = client.get(f'/weathermeasurement/rollup?zone={zone_id}&granularity=week&from=2024-11-10&to=2024-11-20').json
+    # Weeks start on Monday: 2024-11-04 (holds the 10th), 11-11 and 11-18
+    assert [week['Period_Start'] for week in weeks] == ['2024-11-04', '2024-11-11', '2024-11-18']
+    assert sum(week['Measurement_Count'] for week in client.get(
+        f'/weathermeasurement/rollup?zone={zone_id}&granularity=week').json) == 30
+
+
+def test_component_edits_refresh_rollups(app, client):
+    zone_id = ingest_sample(app)
+    with app.app_context():
+        wind_id = db.session.scalar(db.select(Wind.Wind_ID).order_by(Wind.Date))
+        pressure_ids = db.session.scalars(db.select(Pressure.Pressure_ID)).all()
+
+    assert client.put(f'/wind/{wind_id}', json={'Wind_Speed': 100.0}).status_code == 200
+    assert month(client, zone_id)['Wind_Speed_Max'] == 100.0
+    assert month(client, zone_id)['Wind_Speed_Mean'] == pytest.approx(column_mean(app, Wind, Wind.Wind_Speed))
+
+    response = client.put('/pressure/batch', json=[{'Pressure_ID': i, 'PressureValue': 50.0} for i in pressure_ids])
+    assert response.status_code == 200
+    row = month(client, zone_id)
+    assert (row['PressureValue_Min'], row['PressureValue_Max']) == (50.0, 50.0)
+
+    assert client.put('/update_weathermeasurement/1', json={'Max_Temperature_2m': -10.0}).status_code == 200
+    assert month(client, zone_id)['Max_Temperature_2m_Min'] == -10.0
+
+
+def test_rebuild_command_matches_incremental_rollups(app, client):
+    zone_id = ingest_sample(app)
+    client.put('/update_weathermeasurement/3', json={'Cloud_Amount': 80.0})
+    before = month(client, zone_id)
+    with app.app_context():
+        db.session.execute(db.delete(WeatherRollup))
+        db.session.commit()
+    result = app.test_cli_runner().invoke(args=['rebuild-rollups'])
+    assert result.exit_code == 0, result.output
+    after = month(client, zone_id)
+    after.pop('Rollup_ID')
+    before.pop('Rollup_ID')
+    assert after == before
+
+
+def test_rollup_parameters(client):
+    assert client.get('/weathermeasurement/rollup').status_code == 400
+    assert client.get('/weathermeasurement/rollup?zone=1&granularity=day').status_code == 400
+    assert client.get('/weathermeasurement/rollup?zone=1&from=2024-13-01').status_code == 400
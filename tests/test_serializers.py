@@ -0,0 +1,65 @@
+import json
+
+import pytest
+from sqlalchemy import select
+
+from conftest import gbif_zip, ingest_sample
+from prueba import (GeographicZone, Humidity, Precipitation, Pressure, Taxon, Vegetation, WeatherMeasurement, Wind,
+                    db, geographic_zone_schema, humidity_schema, ingest_gbif, precipitation_schema, pressure_schema,
+                    row_serializers, taxon_schema, vegetation_schema, weather_measurement_schema, wind_schema)
+
+SCHEMAS = [(Wind, wind_schema), (Precipitation, precipitation_schema), (Pressure, pressure_schema),
+           (Humidity, humidity_schema), (GeographicZone, geographic_zone_schema),
+           (WeatherMeasurement, weather_measurement_schema), (Vegetation, vegetation_schema), (Taxon, taxon_schema)]
+AT_ZONE = {'decimalLatitude': '-4.9453', 'decimalLongitude': '-79.0319'}
+
+
+def load_sample(app):
+    ingest_sample(app)
+    with app.app_context():
+        ingest_gbif(gbif_zip([
+            {'gbifID': '1', 'eventDate': '2024-11-05', 'taxonKey': '10', 'species': 'Virola a', 'family': 'Myristicaceae', **AT_ZONE},
+            {'gbifID': '2', 'eventDate': '2024-11-06', 'taxonKey': '20', 'species': 'Virola b', **AT_ZONE},
+        ]))
+
+
+@pytest.mark.parametrize('model, schema', SCHEMAS, ids=[model.__name__ for model, _ in SCHEMAS])
+def test_serializer_matches_schema_dump(app, model, schema):
+    load_sample(app)
+    serializer = row_serializers[model]
+    assert serializer is not None
+    pk = model.__table__.primary_key.columns.values()[0]
+    with app.app_context():
+        rows = db.session.execute(select(*serializer.columns).order_by(pk)).all()
+        objects = db.session.scalars(select(model).order_by(pk)).all()
+        assert rows
+        assert serializer.dump(rows) == schema.dump(objects, many=True)
+
+
+def test_projection_matches_schema_only(app):
+    load_sample(app)
+    serializer = row_serializers[WeatherMeasurement].project(frozenset({'Date', 'Cloud_Amount'}), ('ClimateMeasurement_ID',))
+    with app.app_context():
+        rows = db.session.execute(select(*serializer.columns)).all()
+        objects = db.session.scalars(select(WeatherMeasurement)).all()
+        projected = type(weather_measurement_schema)(only=('Date', 'Cloud_Amount'), many=True)
+        assert serializer.dump(rows) == projected.dump(objects)
+    assert serializer.position('ClimateMeasurement_ID') == 2
+
+
+@pytest.mark.parametrize('path', ['/weathermeasurement', '/vegetation', '/taxon', '/wind?stream=json',
+                                  '/geographiczone?stream=ndjson'])
+def test_fast_path_response_matches_jsonify(app, client, path):
+    load_sample(app)
+    bodies = []
+    # Indented output turns the serializers off, so the second request goes through the schemas
+    for compact in (None, False):
+        app.json.compact = compact
+        with client.get(path) as response:
+            assert response.status_code == 200
+            bodies.append(response.get_data(as_text=True))
+    fast, slow = bodies
+    if 'ndjson' in path:
+        assert [json.loads(line) for line in fast.splitlines()] == [json.loads(line) for line in slow.splitlines()]
+    else:
+        assert json.loads(fast) == json.loads(slow)
@@ -0,0 +1,55 @@
+import random
+
+from sqlalchemy import insert
+
+from conftest import make_app
+from prueba import GeographicZone, db, haversine_km
+
+
+def add_random_zones(app, count=300, seed=7):
+    rng = random.Random(seed)
+    rows = [{'Zone_Name': f'Zone {i}', 'Latitude': rng.uniform(-5, 5), 'Longitude': rng.uniform(-80, -70)}
+            for i in range(count)]
+    with app.app_context():
+        db.session.execute(insert(GeographicZone), rows)
+        db.session.commit()
+        return [(zone.GeographicZone_ID, zone.Latitude, zone.Longitude) for zone in GeographicZone.query]
+
+
+def test_nearest_matches_brute_force(app, client):
+    zones = add_random_zones(app)
+    rng = random.Random(1)
+    for _ in range(50):
+        lat, lon = rng.uniform(-8, 8), rng.uniform(-83, -67)
+        expected = sorted((haversine_km(lat, lon, zlat, zlon), zone_id) for zone_id, zlat, zlon in zones)[:3]
+        found = client.get(f'/geographiczone/nearest?lat={lat}&lon={lon}&k=3').json
+        assert [zone['GeographicZone_ID'] for zone in found] == [zone_id for _, zone_id in expected]
+
+
+def test_within_and_bbox_match_brute_force(app, client):
+    zones = add_random_zones(app)
+    lat, lon = 0.5, -75.0
+    found = client.get(f'/geographiczone/within?lat={lat}&lon={lon}&radius_km=150').json
+    assert {zone['GeographicZone_ID'] for zone in found} == \
+        {zone_id for zone_id, zlat, zlon in zones if haversine_km(lat, lon, zlat, zlon) <= 150}
+    found = client.get('/geographiczone/bbox?min_lat=-1&min_lon=-76&max_lat=2&max_lon=-73').json
+    assert {zone['GeographicZone_ID'] for zone in found} == \
+        {zone_id for zone_id, zlat, zlon in zones if -1 <= zlat <= 2 and -76 <= zlon <= -73}
+
+
+def test_index_follows_commits_of_the_app(client):
+    assert client.get('/geographiczone/nearest?lat=0&lon=0').json == []
+    response = client.post('/geographiczone', json={'Zone_Name': 'A', 'Latitude': 0.1, 'Longitude': 0.1})
+    zone_id = response.json['GeographicZone_ID']
+    assert [zone['GeographicZone_ID'] for zone in client.get('/geographiczone/nearest?lat=0&lon=0').json] == [zone_id]
+    client.delete(f'/geographiczone/{zone_id}')
+    assert client.get('/geographiczone/nearest?lat=0&lon=0').json == []
+
+
+def test_index_picks_up_zones_of_other_workers_after_ttl(tmp_path):
+    writer = make_app(tmp_path)
+    reader = make_app(tmp_path, ZONE_INDEX_TTL=0)
+    assert reader.extensions['zone_index'] is not writer.extensions['zone_index']
+    assert reader.test_client().get('/geographiczone/nearest?lat=0&lon=0').json == []
+    writer.test_client().post('/geographiczone', json={'Zone_Name': 'A', 'Latitude': 0.1, 'Longitude': 0.1})
+    assert len(reader.test_client().get('/geographiczone/nearest?lat=0&lon=0').json) == 1
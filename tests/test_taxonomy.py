@@ -0,0 +1,73 @@
+from sqlalchemy import select, text
+
+from conftest import gbif_zip, ingest_sample
+from prueba import Taxon, Vegetation, db, gbif_taxon, ingest_gbif, taxon_filters
+
+AT_ZONE = {'decimalLatitude': '-4.9453', 'decimalLongitude': '-79.0319'}
+VIROLA = {'taxonKey': '10', 'speciesKey': '10', 'scientificName': 'Virola elongata (Benth.) Warb.',
+          'taxonRank': 'SPECIES', 'kingdom': 'Plantae', 'phylum': 'Tracheophyta', 'class': 'Magnoliopsida',
+          'order': 'Magnoliales', 'family': 'Myristicaceae', 'genus': 'Virola', 'species': 'Virola elongata'}
+INGA = {**VIROLA, 'taxonKey': '20', 'speciesKey': '20', 'scientificName': 'Inga edulis Mart.', 'order': 'Fabales',
+        'family': 'Fabaceae', 'genus': 'Inga', 'species': 'Inga edulis'}
+
+
+def occurrence(gbif_id, taxon, day='2024-11-05'):
+    return {'gbifID': str(gbif_id), 'eventDate': day, **AT_ZONE, **taxon}
+
+
+def load_occurrences(app):
+    zone_id = ingest_sample(app)
+    with app.app_context():
+        ingest_gbif(gbif_zip([occurrence(1, VIROLA), occurrence(2, VIROLA, '2024-11-06'), occurrence(3, INGA),
+                              occurrence(4, {'species': 'Unknown sp.'})]))
+    return zone_id
+
+
+def test_gbif_taxon_is_interned():
+    seen = {}
+    first = gbif_taxon(VIROLA, seen)
+    assert gbif_taxon({**VIROLA, 'family': 'Other'}, seen) is first
+    assert first['Taxon_ID'] == first['Species_Key'] == 10
+    assert (first['Class_Name'], first['Order_Name']) == ('Magnoliopsida', 'Magnoliales')
+    assert gbif_taxon({'taxonKey': '30', 'genus': 'x' * 200}, seen)['Genus'] == 'x' * 100
+    assert gbif_taxon({'species': 'No key'}, seen) is None
+    assert set(seen) == {10, 30}
+
+
+def test_occurrences_reference_one_row_per_taxon(app):
+    load_occurrences(app)
+    with app.app_context():
+        assert db.session.scalars(select(Taxon.Taxon_ID).order_by(Taxon.Taxon_ID)).all() == [10, 20]
+        rows = db.session.execute(select(Vegetation.Gbif_ID, Vegetation.Taxon_ID, Vegetation.Vegetation_Type)
+                                  .order_by(Vegetation.Gbif_ID)).all()
+    # The names are only kept on the row when the occurrence has no taxonKey
+    assert rows == [(1, 10, None), (2, 10, None), (3, 20, None), (4, None, 'Unknown sp.')]
+
+
+def test_vegetation_filtered_by_rank_name(app, client):
+    zone_id = load_occurrences(app)
+    def gbif_ids(query):
+        return [item['Gbif_ID'] for item in client.get(f'/vegetation?{query}').json['items']]
+    assert gbif_ids(f'family=Myristicaceae&GeographicZone_ID={zone_id}') == [1, 2]
+    assert gbif_ids('order=Fabales') == [3]
+    assert gbif_ids('kingdom=Plantae&genus=Inga') == [3]
+    assert gbif_ids(f'family=Myristicaceae&GeographicZone_ID={zone_id + 1}') == []
+    assert gbif_ids('family=Rosaceae') == []
+
+
+def test_taxon_endpoints(app, client):
+    load_occurrences(app)
+    assert [taxon['Taxon_ID'] for taxon in client.get('/taxon?class=Magnoliopsida').json['items']] == [10, 20]
+    assert [taxon['Taxon_ID'] for taxon in client.get('/taxon?genus=Virola').json['items']] == [10]
+    assert client.get('/taxon/20').json['Family'] == 'Fabaceae'
+    assert client.get('/taxon/99').status_code == 404
+
+
+def test_family_in_zone_uses_the_taxon_zone_index(app):
+    with app.app_context():
+        query = select(Vegetation.Vegetation_ID).where(*taxon_filters({'family': 'Myristicaceae'}),
+                                                       Vegetation.GeographicZone_ID == 1)
+        compiled = query.compile(db.engine, compile_kwargs={'literal_binds': True})
+        plan = ' '.join(row[-1] for row in db.session.execute(text(f'EXPLAIN QUERY PLAN {compiled}')))
+    assert 'ix_vegetation_taxon_zone' in plan
+    assert 'ix_taxon_Family' in plan
@@ -0,0 +1,21 @@
+# WSGI entry point for multi-process servers, e.g.
+#   gunicorn -w 4 wsgi:app
+# Each worker builds its own app and connection pool on import; create the tables once
+# beforehand with `flask --app prueba init-db`. Avoid --preload, which would share the
+# pool's sockets between forked workers.
+# The recent window store of each worker is warmed here; if the database is not reachable
+# yet it is loaded on the first /zone/<id>/recent request instead.
+import logging
+
+from sqlalchemy.exc import DBAPIError
+
+from prueba import create_app
+
+app = create_app()
+
+if 'recent_store' in app.extensions:
+    with app.app_context():
+        try:
+            app.extensions['recent_store'].ensure_loaded()
+        except DBAPIError:
+            logging.getLogger('prueba.recent').warning('Recent window store not warmed: database unavailable')